@@ -18,23 +18,47 @@ ticktick_api.py — TickTick 統一 API 封裝
   doppler run -p ticktick -c dev -- python3 ticktick_cli.py <command>
 """
 
+import hashlib
 import json
 import mimetypes
 import os
 import re
-import secrets
 import sys
 import time
-import urllib.request
-import urllib.error
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+import requests
+from requests.adapters import HTTPAdapter
+
 try:
     from zoneinfo import ZoneInfo
 except ImportError:  # pragma: no cover - Python < 3.9
     ZoneInfo = None
 
+# orjson（可選）：C 實作、兩個方向都直接走 bytes（省掉 UTF-8 encode/decode
+# 各一趟），sync() 大 payload 與 batch body 快 2–5x；沒裝就退回 stdlib json。
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# ijson（可選）：串流解析，供 search_stream 邊下載邊過濾。
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
 
 # =============================================================================
 # 共用工具
@@ -45,8 +69,11 @@ PRIORITY_REVERSE = {0: "none", 1: "low", 3: "medium", 5: "high"}
 
 
 def _json_output(data):
-    """統一 JSON 輸出"""
-    print(json.dumps(data, ensure_ascii=False, indent=2))
+    """統一 JSON 輸出（sync --full 這類大 dump 用 orjson 快很多）"""
+    if orjson is not None:
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8"))
+    else:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
 
 
 def _error_exit(msg):
@@ -55,6 +82,25 @@ def _error_exit(msg):
     sys.exit(1)
 
 
+class TickTickAPIError(Exception):
+    """TickTick API 呼叫失敗（HTTP 錯誤、連線失敗、資料驗證不過）。
+
+    用例外而非直接 sys.exit：並行 fan-out 時單一請求失敗不會殺掉整個
+    行程，呼叫端（CLI 入口）自行決定怎麼收尾。
+
+    Attributes:
+        status: HTTP 狀態碼（非 HTTP 層的失敗為 None）
+        body: 伺服器回應內文（若有）
+        path: 請求路徑（若有）
+    """
+
+    def __init__(self, message, status=None, body=None, path=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+        self.path = path
+
+
 _HEX_COLOR_RE = re.compile(r"^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$")
 
 
@@ -63,6 +109,32 @@ def check_hex_color(color: str) -> bool:
     return bool(color) and bool(_HEX_COLOR_RE.match(color))
 
 
+_SAFE_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def _safe_id(s: str) -> str:
+    """URL path 用的 ID 轉義。
+
+    TickTick 的 ID 實務上都是 hex ObjectId，完全不需轉義——先用 regex
+    快篩，只有異常字元才走完整的 percent-encoding。
+    """
+    return s if _SAFE_ID_RE.match(s) else urllib.parse.quote(s, safe="")
+
+
+def _task_matches(q: str, t: dict) -> bool:
+    """檢查 casefold 後的關鍵字 q 是否出現在任務的 title/content/desc。
+
+    三個欄位串成一條 haystack（\\x00 分隔，避免跨欄位誤拼出關鍵字），
+    一次 casefold + 一次掃描取代三組 lower/in——大帳號搜尋時省掉
+    每任務兩次字串配置。欄位可能是 None（TickTick 對 content/desc 會回
+    null），需先補空字串。
+    """
+    hay = "\x00".join((t.get("title") or "",
+                       t.get("content") or "",
+                       t.get("desc") or ""))
+    return q in hay.casefold()
+
+
 def to_ticktick_date(dt: datetime, tz: str = None) -> str:
     """把 datetime 轉成 TickTick 接受的日期字串，例如 2026-06-20T08:30:00+0800。
 
@@ -77,7 +149,7 @@ def to_ticktick_date(dt: datetime, tz: str = None) -> str:
     """
     if tz is not None:
         if ZoneInfo is None:
-            _error_exit("zoneinfo 不可用，無法處理具名時區")
+            raise TickTickAPIError("zoneinfo 不可用，無法處理具名時區")
         zone = ZoneInfo(tz)
         dt = dt.replace(tzinfo=zone) if dt.tzinfo is None else dt.astimezone(zone)
     elif dt.tzinfo is None:
@@ -106,21 +178,36 @@ class TickTickAPI:
         "Chrome/131.0.0.0 Safari/537.36"
     )
 
-    # Sync 快取 TTL（秒）
+    # Sync 快取 TTL（秒），記憶體與磁碟兩層共用
     SYNC_CACHE_TTL = 30
 
+    # update_task merge-base 快取 TTL（秒）——連續更新同一任務時省掉重抓
+    TASK_CACHE_TTL = 30
+
+    # 跨 CLI 行程的磁碟快取目錄（CLI 每個命令都是新行程，記憶體快取活不過一次呼叫）
+    CACHE_DIR = os.path.expanduser("~/.cache/ticktick")
+
+    # session token 的磁碟快取壽命（秒）。TickTick web token 實際上活得
+    # 更久，取保守值；過期或被 401 打臉就重登。
+    SESSION_TTL = 24 * 3600
+
     # 請求逾時（秒）。沒有 timeout 時，上游 hang 會讓呼叫端（NAS worker）無限卡死。
     REQUEST_TIMEOUT = 30
 
-    # 暫時性錯誤的重試（指數退避）。只重試 5xx 與連線層失敗；4xx 不重試，
-    # 其中 401 由下方 relogin 另行處理。
+    # 暫時性錯誤的重試（指數退避）。只重試 429/5xx 與連線層失敗；其他 4xx
+    # 不重試，其中 401 由下方 relogin 另行處理。
     MAX_RETRIES = 2
     RETRY_BACKOFF_BASE = 0.5
-    RETRY_STATUS = frozenset({500, 502, 503, 504})
+    RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+    RETRY_AFTER_CAP = 30  # Retry-After 上限（秒），防伺服器叫我們睡一小時
+
+    # 回應大小上限。sync() 全帳號 payload 也遠小於這個數；超過代表
+    # 伺服器壞掉或被塞了奇怪的東西，直接斷線而不是讀到 OOM。
+    MAX_RESPONSE_BYTES = 50 * 1024 * 1024
 
     def __init__(self, username: str, password: str):
         if not username or not password:
-            _error_exit("TICKTICK_USERNAME 或 TICKTICK_PASSWORD 未設定")
+            raise TickTickAPIError("TICKTICK_USERNAME 或 TICKTICK_PASSWORD 未設定")
         # 保留帳密以便 session 過期時自動重登（見 _request 的 401 處理）。
         self._username = username
         self._password = password
@@ -128,18 +215,42 @@ class TickTickAPI:
         self.csrf_token = None
         self.inbox_id = None
         # 生成持久的裝置 ID（同一個 client 實例保持同一裝置身份）
-        self._device_id = "65a0" + secrets.token_hex(10)
+        self._device_id = "65a0" + os.urandom(10).hex()
+        self._init_header_cache()
         # Sync 快取
         self._sync_cache = None
         self._sync_cache_time = 0
-        self._login(username, password)
+        # 單一任務快取 {(project_id, task_id): (task_json, fetched_at)}
+        self._task_cache = {}
+        # 共用連線池：所有流量都打同一個 host，keep-alive 免去每次 TLS 握手
+        self._session = self._build_session()
+        # 先試磁碟上的 session token——每次 CLI 呼叫都重登等於每次多付
+        # 一個 HTTPS 往返；token 失效時 _request 的 401 處理會補登
+        if not self._load_session_from_disk():
+            self._login(username, password)
 
     # ── 內部工具 ──────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """建立帶連線池的 session（v1/v2 endpoint 同 host，共用 keep-alive）"""
+        session = requests.Session()
+        session.mount("https://api.ticktick.com",
+                      HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return session
+
     @property
     def x_device(self) -> str:
-        """生成 x-device header（模擬 TickTick Web 客戶端的裝置資訊）"""
-        return json.dumps({
+        """x-device header（模擬 TickTick Web 客戶端的裝置資訊）"""
+        return self._x_device
+
+    def _init_header_cache(self):
+        """預先序列化不變的 headers。
+
+        裝置資訊在 __init__ 後不會變，x-device 的 json.dumps 和整包
+        指紋 dict 每個請求重建是純浪費——建一次，_headers 只做 copy。
+        """
+        self._x_device = json.dumps({
             "platform": "web",
             "os": "OS X",
             "device": "Chrome 131.0.0.0",
@@ -150,20 +261,18 @@ class TickTickAPI:
             "campaign": "",
             "websocket": "",
         })
-
-    def _headers(self, extra: dict = None) -> dict:
-        """構建完整的瀏覽器指紋 headers"""
-        h = {
+        self._base_headers = {
             # 核心認證 headers
             "User-Agent": self.USER_AGENT,
-            "x-device": self.x_device,
+            "x-device": self._x_device,
             "Content-Type": "application/json",
             # 瀏覽器指紋 headers
             "Origin": self.ORIGIN,
             "Referer": f"{self.ORIGIN}/",
             "Accept": "application/json, text/plain, */*",
             "Accept-Language": "zh-TW,zh;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "identity",
+            # sync() 回傳量大，gzip 可縮 5–10x；requests 會自動解壓
+            "Accept-Encoding": "gzip, deflate",
             "Sec-Ch-Ua": '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
             "Sec-Ch-Ua-Mobile": "?0",
             "Sec-Ch-Ua-Platform": '"macOS"',
@@ -172,6 +281,31 @@ class TickTickAPI:
             "Sec-Fetch-Site": "same-site",
             "X-Requested-With": "XMLHttpRequest",
         }
+
+    def _read_body(self, resp) -> bytes:
+        """分塊讀取回應內容，超過上限就斷線報錯。
+
+        無上限的 read() 對著壞掉的伺服器回應可能讀到 OOM；這裡以 64 KiB
+        為單位累積（gzip 由 urllib3 邊讀邊解），Content-Length 可信時先
+        快速擋掉。
+        """
+        clen = resp.headers.get("Content-Length")
+        if clen and clen.isdigit() and int(clen) > self.MAX_RESPONSE_BYTES:
+            resp.close()
+            raise TickTickAPIError(
+                f"回應過大（Content-Length {clen} > {self.MAX_RESPONSE_BYTES}）")
+        buf = bytearray()
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            buf += chunk
+            if len(buf) > self.MAX_RESPONSE_BYTES:
+                resp.close()
+                raise TickTickAPIError(
+                    f"回應超過大小上限 {self.MAX_RESPONSE_BYTES} bytes")
+        return bytes(buf)
+
+    def _headers(self, extra: dict = None) -> dict:
+        """構建完整的瀏覽器指紋 headers（以快取的基底 dict 起手）"""
+        h = self._base_headers.copy()
         if self.session_token:
             h["Cookie"] = f"t={self.session_token}"
         if extra:
@@ -182,100 +316,194 @@ class TickTickAPI:
                  params: dict = None, _retried: bool = False) -> dict | list | str:
         """發送 API 請求"""
         url = self.BASE_URL + path
-        if params:
-            qs = urllib.parse.urlencode(params)
-            url = f"{url}?{qs}"
-
-        if data is not None:
-            body = json.dumps(data).encode("utf-8")
-        else:
-            body = None
-        req = urllib.request.Request(url, data=body, method=method,
-                                    headers=self._headers())
+        body = _dumps(data) if data is not None else None
 
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                with urllib.request.urlopen(req, timeout=self.REQUEST_TIMEOUT) as resp:
-                    text = resp.read().decode("utf-8")
-                    if not text:
-                        return {}
-                    return json.loads(text)
-            except urllib.error.HTTPError as e:
-                # Session 過期會回 401。lazy singleton client 不會自己重登，過期後
-                # 會一路失敗到行程重啟——所以這裡自動重登一次再重試（旗標防無限迴圈）。
-                if (e.code == 401 and not _retried
-                        and self._username and self._password):
-                    self._login(self._username, self._password)
-                    return self._request(method, path, data, params, _retried=True)
-                # 5xx 是暫時性的（TickTick/Cloudflare 偶發），退避後重試。
-                if e.code in self.RETRY_STATUS and attempt < self.MAX_RETRIES:
-                    time.sleep(self.RETRY_BACKOFF_BASE * (2 ** attempt))
-                    continue
-                body_text = e.read().decode("utf-8", errors="replace")
-                _error_exit(f"API 錯誤 HTTP {e.code}: {body_text}")
-            except urllib.error.URLError as e:
-                # 連線層失敗（DNS、連線被拒、逾時）。socket.timeout 也會包成 URLError，
-                # 沒有這個分支會直接外洩成未捕捉例外（後端變成不透明的 500）。
-                # 暫時性居多，退避後重試，耗盡才報錯。
+                resp = self._session.request(
+                    method, url, params=params, data=body,
+                    headers=self._headers(), stream=True,
+                    timeout=self.REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                # 連線層失敗（DNS、連線被拒、逾時）。暫時性居多，退避後重試，
+                # 耗盡才報錯——不能讓例外外洩成未捕捉（後端變成不透明的 500）。
                 if attempt < self.MAX_RETRIES:
                     time.sleep(self.RETRY_BACKOFF_BASE * (2 ** attempt))
                     continue
-                _error_exit(f"連線 TickTick 失敗或逾時: {e.reason}")
+                raise TickTickAPIError(f"連線 TickTick 失敗或逾時: {e}", path=path)
+            # Session 過期會回 401。lazy singleton client 不會自己重登，過期後
+            # 會一路失敗到行程重啟——所以這裡自動重登一次再重試（旗標防無限迴圈）。
+            if (resp.status_code == 401 and not _retried
+                    and self._username and self._password):
+                resp.close()
+                self._clear_session_cache()
+                self._login(self._username, self._password)
+                return self._request(method, path, data, params, _retried=True)
+            # 429/5xx 是暫時性的（限流、TickTick/Cloudflare 偶發），退避後重試；
+            # 伺服器有給 Retry-After 就照辦（設上限）。
+            if resp.status_code in self.RETRY_STATUS and attempt < self.MAX_RETRIES:
+                retry_after = resp.headers.get("Retry-After")
+                resp.close()
+                if retry_after and retry_after.isdigit():
+                    time.sleep(min(int(retry_after), self.RETRY_AFTER_CAP))
+                else:
+                    time.sleep(self.RETRY_BACKOFF_BASE * (2 ** attempt))
+                continue
+            if resp.status_code >= 400:
+                raise TickTickAPIError(
+                    f"API 錯誤 HTTP {resp.status_code}: {resp.text}",
+                    status=resp.status_code, body=resp.text, path=path)
+            content = self._read_body(resp)
+            if not content:
+                return {}
+            return _loads(content)
 
     def _invalidate_cache(self):
-        """清除 sync 快取（修改操作後呼叫）"""
+        """清除 sync 快取（修改操作後呼叫，磁碟層一併清掉以免下個行程讀到舊資料）"""
         self._sync_cache = None
         self._sync_cache_time = 0
+        try:
+            os.remove(self._sync_disk_path())
+        except OSError:
+            pass
+
+    def _session_disk_path(self) -> str:
+        """session token 快取路徑（同 sync 快取，以帳號 hash 當 key）"""
+        key = hashlib.sha256((self._username or "").encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.CACHE_DIR, f"session-{key}.json")
+
+    def _load_session_from_disk(self) -> bool:
+        """讀磁碟上的 session token；有效就直接上崗，免掉一次登入往返"""
+        try:
+            with open(self._session_disk_path(), "rb") as f:
+                data = _loads(f.read())
+        except (OSError, ValueError):
+            return False
+        if not data.get("token") or time.time() >= data.get("expiry", 0):
+            return False
+        self.session_token = data["token"]
+        self.csrf_token = data.get("csrf_token")
+        self.inbox_id = data.get("inbox_id", "")
+        return True
+
+    def _save_session_to_disk(self):
+        """寫 session token 快取（0600 + 原子替換；寫失敗不影響主流程）"""
+        path = self._session_disk_path()
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(_dumps({
+                    "token": self.session_token,
+                    "csrf_token": self.csrf_token,
+                    "inbox_id": self.inbox_id,
+                    "expiry": time.time() + self.SESSION_TTL,
+                }))
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _clear_session_cache(self):
+        """丟掉磁碟上的 session token（401 打臉後呼叫）"""
+        try:
+            os.remove(self._session_disk_path())
+        except OSError:
+            pass
+
+    def _sync_disk_path(self) -> str:
+        """磁碟快取路徑（以帳號 hash 當 key，多帳號不互踩）"""
+        key = hashlib.sha256((self._username or "").encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.CACHE_DIR, f"sync-{key}.json")
+
+    def _load_sync_from_disk(self, now: float):
+        """讀磁碟快取；以檔案 mtime 當時間戳，過期或損毀回 None"""
+        path = self._sync_disk_path()
+        try:
+            mtime = os.path.getmtime(path)
+            if now - mtime >= self.SYNC_CACHE_TTL:
+                return None
+            with open(path, "rb") as f:
+                data = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        self._sync_cache = data
+        self._sync_cache_time = mtime
+        return data
+
+    def _save_sync_to_disk(self, data: dict):
+        """寫磁碟快取（0600 + 原子替換；寫失敗不影響主流程）"""
+        path = self._sync_disk_path()
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(_dumps(data))
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, path)
+        except OSError:
+            pass
 
     # ── 認證 ──────────────────────────────────────────────────────────────
 
     def _login(self, username: str, password: str):
         """帳密登入取得 session token（嘗試多個端點）"""
-        payload = json.dumps({"username": username, "password": password}).encode()
-        params = urllib.parse.urlencode({"wc": "true", "remember": "true"})
+        payload = _dumps({"username": username, "password": password})
+        params = {"wc": "true", "remember": "true"}
 
         # TickTick 有兩個登入端點，依版本不同
         endpoints = ["/user/signon", "/user/signin"]
         last_error = None
 
         for endpoint in endpoints:
-            url = f"{self.BASE_URL}{endpoint}?{params}"
-            req = urllib.request.Request(url, data=payload, method="POST",
-                                        headers=self._headers())
+            url = f"{self.BASE_URL}{endpoint}"
             try:
-                with urllib.request.urlopen(req, timeout=self.REQUEST_TIMEOUT) as resp:
-                    # 從 Set-Cookie 擷取 _csrf_token
-                    for header in resp.headers.get_all("Set-Cookie") or []:
-                        if "_csrf_token=" in header:
-                            self.csrf_token = header.split("_csrf_token=")[1].split(";")[0]
-                    result = json.loads(resp.read().decode("utf-8"))
-                    self.session_token = result.get("token")
-                    self.inbox_id = result.get("inboxId", "")
-                    if self.session_token:
-                        return  # 登入成功
-            except urllib.error.HTTPError as e:
-                last_error = f"HTTP {e.code}: {e.read().decode('utf-8', errors='replace')}"
+                resp = self._session.post(url, params=params, data=payload,
+                                          headers=self._headers(),
+                                          timeout=self.REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                last_error = f"連線失敗或逾時: {e}"
                 continue  # 嘗試下一個端點
-            except urllib.error.URLError as e:
-                last_error = f"連線失敗或逾時: {e.reason}"
+            if resp.status_code >= 400:
+                last_error = f"HTTP {resp.status_code}: {resp.text}"
                 continue  # 嘗試下一個端點
-
-        _error_exit(f"登入失敗（已嘗試所有端點）: {last_error}")
+            # 從 Set-Cookie 擷取 _csrf_token。交給 requests 的 cookie jar
+            # 解析（處理引號、URL-encode 等邊角），不要自己切字串。
+            csrf = resp.cookies.get("_csrf_token")
+            if csrf:
+                self.csrf_token = csrf
+            result = resp.json()
+            self.session_token = result.get("token")
+            self.inbox_id = result.get("inboxId", "")
+            if self.session_token:
+                # token 走 _headers 的手動 Cookie 注入；清空 jar 以免重複送出
+                self._session.cookies.clear()
+                self._save_session_to_disk()
+                return  # 登入成功
+
+        raise TickTickAPIError(f"登入失敗（已嘗試所有端點）: {last_error}")
 
     # ── 全量同步（帶快取）────────────────────────────────────────────────
 
     def sync(self, force: bool = False) -> dict:
         """一次取得帳號全部資料（tasks, projects, tags, folders）
 
-        帶有 TTL 快取，避免短時間內重複請求。
+        帶有兩層 TTL 快取：行程內記憶體 + 磁碟（~/.cache/ticktick）。
+        CLI 每個命令都是新行程，磁碟層讓 `tags` 接著 `search` 只付一次
+        全帳號下載。`force=True` 直接打 API。
         """
         now = time.time()
         if (not force and self._sync_cache is not None
                 and now - self._sync_cache_time < self.SYNC_CACHE_TTL):
             return self._sync_cache
+        if not force:
+            cached = self._load_sync_from_disk(now)
+            if cached is not None:
+                return cached
         data = self._request("GET", "/batch/check/0")
         self._sync_cache = data
         self._sync_cache_time = now
+        self._save_sync_to_disk(data)
         return data
 
     # ── Task Operations ──────────────────────────────────────────────────
@@ -286,13 +514,15 @@ class TickTickAPI:
         data = self.sync()
         for t in data.get("syncTaskBean", {}).get("update", []):
             if t.get("id") == task_id:
+                self._task_cache[(project_id, task_id)] = (t, time.time())
                 return t
         # Fallback: 從 completed tasks 找
         completed = self.get_completed_tasks(project_id=project_id, limit=200)
         for t in completed:
             if t.get("id") == task_id:
+                self._task_cache[(project_id, task_id)] = (t, time.time())
                 return t
-        _error_exit(f"找不到任務 {task_id}（active 和 completed 都查過了）")
+        raise TickTickAPIError(f"找不到任務 {task_id}（active 和 completed 都查過了）")
 
     def list_tasks(self, project_id: str = None) -> list:
         """列出進行中的任務"""
@@ -305,13 +535,17 @@ class TickTickAPI:
     def list_recent_tasks(self, project_id: str, limit: int = 10,
                           include_completed: bool = True) -> list:
         """列出專案最近的任務（active + completed 合併，按時間排序）"""
-        # Active tasks
-        tasks = self.list_tasks(project_id)
-        # Completed tasks
         if include_completed:
-            completed = self.get_completed_tasks(
-                project_id=project_id, limit=limit)
-            tasks.extend(completed)
+            # active 和 completed 是兩條獨立請求，並行抓省一個 RTT
+            # （session 連線池 thread-safe，兩條各用一條 keep-alive 連線）
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                active_f = ex.submit(self.list_tasks, project_id)
+                completed_f = ex.submit(self.get_completed_tasks,
+                                        project_id=project_id, limit=limit)
+                tasks = active_f.result()
+                tasks.extend(completed_f.result())
+        else:
+            tasks = self.list_tasks(project_id)
         # 按建立時間倒序
         tasks.sort(
             key=lambda t: t.get("completedTime") or t.get("createdTime", ""),
@@ -328,17 +562,54 @@ class TickTickAPI:
             result["_input"] = task_data
         return result
 
-    def update_task(self, task_data: dict) -> dict:
-        """更新任務（GET-merge-POST，保留既有欄位）"""
+    def batch_create_tasks(self, tasks: list) -> dict:
+        """批次建立任務：整個 list 一個請求，取代逐筆 create 的 N 個 RTT"""
+        result = self._request("POST", "/batch/task", {"add": tasks})
+        self._invalidate_cache()
+        return result
+
+    def batch_update_tasks(self, tasks: list) -> dict:
+        """批次更新任務。
+
+        每筆須是「完整」的 task JSON（含 id/projectId）——這裡不做
+        update_task 的 GET-merge，缺的欄位會被伺服器清掉。
+        """
+        result = self._request("POST", "/batch/task", {"update": tasks})
+        self._invalidate_cache()
+        return result
+
+    def batch_delete_tasks(self, items: list) -> dict:
+        """批次刪除任務。items: [{"taskId": ..., "projectId": ...}, ...]"""
+        result = self._request("POST", "/batch/task", {"delete": items})
+        self._invalidate_cache()
+        for it in items:
+            self._task_cache.pop((it.get("projectId"), it.get("taskId")), None)
+        return result
+
+    def update_task(self, task_data: dict, use_cache: bool = True) -> dict:
+        """更新任務（GET-merge-POST，保留既有欄位）
+
+        merge base 走短 TTL 的任務快取：連續更新同一任務（腳本批次
+        改欄位很常見）只付一次 GET。`use_cache=False` 強制重抓。
+        """
         task_id = task_data.get("id")
         project_id = task_data.get("projectId")
         if not task_id or not project_id:
-            _error_exit("update_task 需要 id 和 projectId")
+            raise TickTickAPIError("update_task 需要 id 和 projectId")
         # 先取完整 task data（含 attachments 等），merge 更新欄位
-        existing = self.get_task(project_id, task_id)
+        key = (project_id, task_id)
+        cached = self._task_cache.get(key) if use_cache else None
+        if cached and time.time() - cached[1] < self.TASK_CACHE_TTL:
+            existing = dict(cached[0])
+        else:
+            # copy：get_task 回傳的 dict 同時躺在 task/sync 快取裡，
+            # 就地 merge 會在 POST 失敗時把沒被接受的欄位留在快取中
+            existing = dict(self.get_task(project_id, task_id))
         existing.update(task_data)
         result = self._request("POST", "/batch/task", {"update": [existing]})
         self._invalidate_cache()
+        # 伺服器剛接受這份 merge 結果，直接當下一次的 merge base
+        self._task_cache[key] = (existing, time.time())
         return result
 
     def complete_task(self, project_id: str, task_id: str) -> dict:
@@ -347,6 +618,7 @@ class TickTickAPI:
         existing["status"] = 2
         result = self._request("POST", "/batch/task", {"update": [existing]})
         self._invalidate_cache()
+        self._task_cache.pop((project_id, task_id), None)
         return result
 
     def delete_task(self, project_id: str, task_id: str) -> dict:
@@ -356,6 +628,7 @@ class TickTickAPI:
             "projectId": project_id,
         }]})
         self._invalidate_cache()
+        self._task_cache.pop((project_id, task_id), None)
         return result
 
     def move_task(self, task_id: str, from_project_id: str,
@@ -404,31 +677,67 @@ class TickTickAPI:
             query: 搜尋關鍵字
             include_completed: 是否包含已完成任務（預設 True）
         """
-        q = query.lower()
+        q = query.casefold()
 
-        def _match(t):
-            # 欄位可能是 None（TickTick 對 content/desc 會回 null），需防 None.lower()
-            return (q in (t.get("title") or "").lower() or
-                    q in (t.get("content") or "").lower() or
-                    q in (t.get("desc") or "").lower())
+        if include_completed:
+            # sync 與 completed 並行抓（同 list_recent_tasks）
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                sync_f = ex.submit(self.sync)
+                completed_f = ex.submit(self.get_completed_tasks, limit=200)
+                data = sync_f.result()
+                completed = completed_f.result()
+        else:
+            data = self.sync()
+            completed = []
 
-        # 搜尋 active tasks
-        data = self.sync()
         active = data.get("syncTaskBean", {}).get("update", [])
-        results = [t for t in active if _match(t)]
+        results = [t for t in active if _task_matches(q, t)]
+        results.extend([t for t in completed if _task_matches(q, t)])
+        return results
 
-        # 搜尋 completed tasks
-        if include_completed:
-            completed = self.get_completed_tasks(limit=200)
-            results.extend([t for t in completed if _match(t)])
+    def search_stream(self, query: str, _retried: bool = False):
+        """串流搜尋進行中任務（邊下載邊過濾，不建整棵 sync DOM）
 
-        return results
+        用 ijson 逐筆解析 /batch/check/0 的任務陣列，峰值記憶體只有
+        單一 task dict——超大帳號不會把整包 payload 留在記憶體裡。
+        會繞過 sync 快取；沒裝 ijson 時退回 search_tasks（僅 active）。
+        """
+        if ijson is None:
+            yield from self.search_tasks(query, include_completed=False)
+            return
+        q = query.casefold()
+        resp = self._session.request(
+            "GET", self.BASE_URL + "/batch/check/0",
+            headers=self._headers(), stream=True,
+            timeout=self.REQUEST_TIMEOUT)
+        # 和 _request 一樣：401 當 session 過期處理，重登一次再重來
+        if (resp.status_code == 401 and not _retried
+                and self._username and self._password):
+            resp.close()
+            self._clear_session_cache()
+            self._login(self._username, self._password)
+            yield from self.search_stream(query, _retried=True)
+            return
+        if resp.status_code >= 400:
+            body = resp.text
+            resp.close()
+            raise TickTickAPIError(
+                f"API 錯誤 HTTP {resp.status_code}: {body}",
+                status=resp.status_code, body=body, path="/batch/check/0")
+        try:
+            resp.raw.decode_content = True  # gzip 由 urllib3 邊讀邊解
+            for t in ijson.items(resp.raw, "syncTaskBean.update.item"):
+                if _task_matches(q, t):
+                    yield t
+        finally:
+            # generator 被提早丟棄時也要把連線還給 pool
+            resp.close()
 
     def get_completed_tasks(self, project_id: str = None,
                             limit: int = 50) -> list:
         """取得已完成任務"""
         if project_id:
-            pid = urllib.parse.quote(project_id, safe="")
+            pid = _safe_id(project_id)
             path = f"/project/{pid}/completed"
         else:
             path = "/project/all/completed"
@@ -448,7 +757,7 @@ class TickTickAPI:
         for p in projects:
             if p.get("id") == project_id:
                 return p
-        _error_exit(f"找不到專案 {project_id}")
+        raise TickTickAPIError(f"找不到專案 {project_id}")
 
     def get_project_data(self, project_id: str) -> dict:
         """取得專案 + 其所有任務"""
@@ -492,7 +801,8 @@ class TickTickAPI:
         tag = {"label": name, "name": name.lower(), "sortType": "project"}
         if color:
             if not check_hex_color(color):
-                _error_exit(f"無效的 hex color: {color!r}（需如 #RRGGBB 或 #RGB）")
+                raise TickTickAPIError(
+                    f"無效的 hex color: {color!r}（需如 #RRGGBB 或 #RGB）")
             tag["color"] = color
         if parent:
             tag["parent"] = parent.lower()
@@ -521,8 +831,9 @@ class TickTickAPI:
         """
         color = color or "#97E38B"            # 預設綠色
         if not check_hex_color(color):
-            _error_exit(f"無效的 hex color: {color!r}（需如 #RRGGBB 或 #RGB）")
-        habit_id = format(int(time.time()), '08x') + secrets.token_hex(8)
+            raise TickTickAPIError(
+                f"無效的 hex color: {color!r}（需如 #RRGGBB 或 #RGB）")
+        habit_id = format(int(time.time()), '08x') + os.urandom(8).hex()
         today = time.strftime("%Y%m%d")
         # 根據週期建立 RRULE
         if period == "week":
@@ -570,7 +881,7 @@ class TickTickAPI:
         if not date:
             from datetime import datetime
             date = datetime.now().strftime("%Y%m%d")
-        checkin_id = format(int(time.time()), '08x') + secrets.token_hex(8)
+        checkin_id = format(int(time.time()), '08x') + os.urandom(8).hex()
         checkin = {
             "id": checkin_id,
             "habitId": habit_id,
@@ -604,53 +915,47 @@ class TickTickAPI:
             API 回應 dict，包含 id, path, size, fileName, fileType, createdTime
         """
         if not os.path.exists(file_path):
-            _error_exit(f"檔案不存在: {file_path}")
+            raise TickTickAPIError(f"檔案不存在: {file_path}")
 
         # 生成 attachment ID（24 位 hex，類似 MongoDB ObjectId）
         timestamp_hex = format(int(time.time()), '08x')
-        random_hex = secrets.token_hex(8)
+        random_hex = os.urandom(8).hex()
         attachment_id = timestamp_hex + random_hex
 
         filename = os.path.basename(file_path)
         content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
 
-        # 構建 multipart/form-data body
-        boundary = "----WebKitFormBoundary" + secrets.token_hex(8)
-        with open(file_path, "rb") as f:
-            file_data = f.read()
-
-        body = (
-            f"--{boundary}\r\n"
-            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
-            f"Content-Type: {content_type}\r\n"
-            f"\r\n"
-        ).encode("utf-8") + file_data + f"\r\n--{boundary}--\r\n".encode("utf-8")
-
         # 使用 V1 attachment endpoint
-        pid = urllib.parse.quote(project_id, safe="")
-        tid = urllib.parse.quote(task_id, safe="")
+        pid = _safe_id(project_id)
+        tid = _safe_id(task_id)
         url = f"https://api.ticktick.com/api/v1/attachment/upload/{pid}/{tid}/{attachment_id}"
 
+        # multipart 的 Content-Type（含 boundary）由 requests 自己設
         headers = self._headers()
-        headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+        del headers["Content-Type"]
         headers["Accept"] = "*/*"
         if self.csrf_token:
             headers["x-csrftoken"] = self.csrf_token
             headers["Cookie"] = f"t={self.session_token}; _csrf_token={self.csrf_token}"
 
-        req = urllib.request.Request(url, data=body, method="POST", headers=headers)
-
+        # 直接把檔案物件交給 requests 串流上傳：大附件（幾十 MB 起跳）
+        # 不會先整包讀進記憶體再複製一次成 multipart body
         try:
-            with urllib.request.urlopen(req, timeout=self.REQUEST_TIMEOUT) as resp:
-                text = resp.read().decode("utf-8")
-                result = json.loads(text) if text else {}
-                result["attachmentUrl"] = (
-                    f"https://ticktick.com/api/v1/attachment/{pid}/{tid}/{attachment_id}"
-                )
-                return result
-        except urllib.error.HTTPError as e:
-            body_text = e.read().decode("utf-8", errors="replace")
-            _error_exit(f"附件上傳失敗 HTTP {e.code}: {body_text}")
+            with open(file_path, "rb") as f:
+                resp = self._session.post(
+                    url, files={"file": (filename, f, content_type)},
+                    headers=headers, timeout=self.REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise TickTickAPIError(f"附件上傳失敗: {e}")
+        if resp.status_code >= 400:
+            raise TickTickAPIError(
+                f"附件上傳失敗 HTTP {resp.status_code}: {resp.text}",
+                status=resp.status_code, body=resp.text)
+        result = resp.json() if resp.content else {}
+        result["attachmentUrl"] = (
+            f"https://ticktick.com/api/v1/attachment/{pid}/{tid}/{attachment_id}"
+        )
+        return result
 
     # ── User & Settings ──────────────────────────────────────────────────
 
@@ -674,6 +979,6 @@ def create_client_from_env() -> TickTickAPI:
     password = os.environ.get("TICKTICK_PASSWORD")
 
     if not username or not password:
-        _error_exit("需要設定 TICKTICK_USERNAME 和 TICKTICK_PASSWORD 環境變數")
+        raise TickTickAPIError("需要設定 TICKTICK_USERNAME 和 TICKTICK_PASSWORD 環境變數")
 
     return TickTickAPI(username=username, password=password)
@@ -20,23 +20,33 @@ ticktick_cli.py — TickTick CLI 入口
   doppler run -p ticktick -c dev -- python3 scripts/ticktick_cli.py search "站會"
 """
 
-import argparse
 import json
 import re
 import sys
 import os
 from datetime import datetime
+from types import SimpleNamespace
 
 # 確保可以 import 同目錄的 ticktick_api
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from ticktick_api import (
-    create_client_from_env,
-    PRIORITY_MAP,
-    PRIORITY_REVERSE,
-    _json_output,
-    _error_exit,
-)
+
+def _load_api():
+    """延遲載入 ticktick_api（連帶 requests）
+
+    handler 共用的符號統一在這裡注入 globals()；--help、錯誤命令等
+    不打 API 的路徑完全不付這筆 import 成本。
+    """
+    global create_client_from_env, PRIORITY_MAP, PRIORITY_REVERSE
+    global TickTickAPIError, _json_output, _error_exit
+    from ticktick_api import (
+        create_client_from_env,
+        PRIORITY_MAP,
+        PRIORITY_REVERSE,
+        TickTickAPIError,
+        _json_output,
+        _error_exit,
+    )
 
 
 # =============================================================================
@@ -253,7 +263,7 @@ def cmd_task_update(args):
     if args.tag:
         data["tags"] = args.tag
 
-    result = client.update_task(data)
+    result = client.update_task(data, use_cache=not args.no_cache)
     _json_output(result)
 
 
@@ -271,6 +281,29 @@ def cmd_task_delete(args):
     _json_output({"success": True, "deleted": args.task_id})
 
 
+def cmd_task_batch(args):
+    """批次任務操作（從 JSON 檔讀 add/update/delete，一個請求搞定）"""
+    try:
+        with open(args.file, encoding="utf-8") as f:
+            spec = json.load(f)
+    except (OSError, ValueError) as e:
+        _error_exit(f"讀取 {args.file} 失敗: {e}")
+    # 直接給陣列視為「全部新增」
+    if isinstance(spec, list):
+        spec = {"add": spec}
+    if not any(spec.get(k) for k in ("add", "update", "delete")):
+        _error_exit("JSON 需含 add/update/delete 至少其一（或直接給任務陣列）")
+    client = create_client_from_env()
+    result = {}
+    if spec.get("add"):
+        result["add"] = client.batch_create_tasks(spec["add"])
+    if spec.get("update"):
+        result["update"] = client.batch_update_tasks(spec["update"])
+    if spec.get("delete"):
+        result["delete"] = client.batch_delete_tasks(spec["delete"])
+    _json_output(result)
+
+
 def cmd_task_recent(args):
     """查看專案最近 N 筆任務（含已完成，供建立新任務時參考）"""
     client = create_client_from_env()
@@ -419,159 +452,397 @@ def cmd_sync(args):
 
 
 # =============================================================================
-# argparse 定義
+# argparse 定義（延遲建構：只建被呼叫的那個子命令的 parser）
 # =============================================================================
 
-def build_parser():
+# choices 共用常數：tuple 一次配置，跨子命令重用
+_VIEW_CHOICES = ("list", "kanban", "timeline")
+_PRIORITY_CHOICES = ("none", "low", "medium", "high")
+_PROJECT_KIND_CHOICES = ("TASK", "NOTE")
+_TASK_KIND_CHOICES = ("TEXT", "NOTE", "CHECKLIST")
+_STATUS_CHOICES = ("pending", "completed")
+_PERIOD_CHOICES = ("day", "week")
+
+# 命令 → 一行說明。同時供 --help 的靜態總覽與個別 parser 的 description，
+# 印說明不需要把 20 多個 subparser 全部建出來。
+COMMAND_HELP = {
+    "projects": "列出所有專案",
+    "project-get": "取得專案詳情（含任務）",
+    "project-create": "建立專案",
+    "project-update": "更新專案",
+    "project-delete": "刪除專案",
+    "tasks": "列出任務",
+    "task-get": "取得單一任務",
+    "task-create": "建立任務",
+    "task-update": "更新任務",
+    "task-complete": "完成任務",
+    "task-delete": "刪除任務",
+    "task-batch": "批次任務操作（JSON 檔含 add/update/delete 陣列）",
+    "task-recent": "查看專案最近 N 筆任務（含已完成，建立前先確認無重複）",
+    "search": "搜尋任務（預設包含已完成任務）",
+    "completed": "已完成任務歷史",
+    "tags": "列出所有標籤",
+    "tag-create": "建立標籤",
+    "sync": "全量同步（除錯用）",
+    "habits": "列出所有習慣",
+    "habit-create": "建立習慣",
+    "habit-checkin": "習慣打卡",
+    "habit-delete": "刪除習慣",
+    "upload-attachment": "上傳附件到任務",
+}
+
+
+# 參數說明字串只有 -h/--help/--argparse 會用到；其他呼叫一律 help=None，
+# 不讓 spec 表抓著幾十條說明字串不放（字串常數仍在 code object 裡，零成本）
+_WANT_HELP = any(a in ("-h", "--help", "--argparse") for a in sys.argv[1:])
+if _WANT_HELP:
+    def _H(s):
+        return s
+else:
+    def _H(s):
+        return None
+
+
+# create/update 成對命令共用的參數規格：(flags, kwargs)；
+# 個別差異（required、"新⋯" 的 help）由 _override 覆寫
+_COMMON_PROJECT_FIELDS = (
+    (("--name",), {"help": _H("專案名稱")}),
+    (("--color",), {"help": _H('顏色 hex，如 "#FF5733"')}),
+)
+
+_COMMON_TASK_FIELDS = (
+    (("--project",), {"required": True, "help": _H("專案 ID")}),
+    (("--title",), {"help": _H("任務標題")}),
+    (("--content",), {"help": _H("任務內容/備註")}),
+    (("--priority",), {"choices": _PRIORITY_CHOICES, "help": _H("優先級")}),
+    (("--due",), {"help": _H('到期日 "yyyy-MM-ddTHH:mm:ssZ"')}),
+    (("--start",), {"help": _H('開始日期 "yyyy-MM-ddTHH:mm:ssZ"')}),
+    (("--tag",), {"action": "append", "help": _H("標籤（可多次指定）")}),
+)
+
+
+def _override(specs, **overrides):
+    """複製共用規格，按參數名覆寫個別 kwargs"""
+    out = []
+    for flags, kw in specs:
+        name = flags[0].lstrip("-")
+        if name in overrides:
+            kw = {**kw, **overrides[name]}
+        out.append((flags, kw))
+    return tuple(out)
+
+
+# 每個命令的完整參數文法，(flags, kwargs) 表格：
+# 手刻 parser 與 argparse 路徑（--help / --argparse）都吃同一份，
+# 不會有兩套文法漂移的問題。kwargs 用 argparse 的詞彙
+# （required / action / choices / type / default / help）。
+COMMAND_SPECS = {
+    "projects": (),
+    "project-get": ((("project_id",), {"help": _H("專案 ID")}),),
+    "project-create": _override(
+        _COMMON_PROJECT_FIELDS,
+        name={"required": True, "help": _H("專案名稱")},
+    ) + (
+        (("--view",), {"choices": _VIEW_CHOICES, "help": _H("視圖模式")}),
+        (("--kind",), {"choices": _PROJECT_KIND_CHOICES, "default": "TASK",
+                       "help": _H("專案類型")}),
+    ),
+    "project-update": (
+        (("project_id",), {"help": _H("專案 ID")}),
+    ) + _override(
+        _COMMON_PROJECT_FIELDS,
+        name={"help": _H("新名稱")}, color={"help": _H("新顏色")},
+    ),
+    "project-delete": ((("project_id",), {"help": _H("專案 ID")}),),
+    "tasks": (
+        (("--project",), {"help": _H("專案 ID（不指定則列出全部）")}),
+        (("--status",), {"choices": _STATUS_CHOICES, "help": _H("過濾狀態")}),
+        (("--tag",), {"help": _H("按 tag 篩選")}),
+    ),
+    "task-get": (
+        (("project_id",), {"help": _H("專案 ID")}),
+        (("task_id",), {"help": _H("任務 ID")}),
+    ),
+    "task-create": _override(
+        _COMMON_TASK_FIELDS,
+        title={"required": True, "help": _H("任務標題")},
+    ) + (
+        (("--desc",), {"help": _H("Checklist 描述")}),
+        (("--all-day",), {"action": "store_true", "help": _H("全天任務")}),
+        (("--timezone",), {"help": _H('時區，如 "Asia/Taipei"')}),
+        (("--kind",), {"choices": _TASK_KIND_CHOICES, "help": _H("任務類型")}),
+        (("--reminder",), {"action": "append",
+                           "help": _H('提醒規則，如 "TRIGGER:-PT30M"（可多次指定）')}),
+        (("--repeat",), {"help": _H('重複規則 RRULE，如 "RRULE:FREQ=DAILY"')}),
+        (("--subtask",), {"action": "append", "help": _H("子任務標題（可多次指定）")}),
+    ),
+    "task-update": (
+        (("task_id",), {"help": _H("任務 ID")}),
+    ) + _override(
+        _COMMON_TASK_FIELDS,
+        title={"help": _H("新標題")}, content={"help": _H("新內容")},
+        priority={"choices": _PRIORITY_CHOICES, "help": _H("新優先級")},
+        due={"help": _H("新到期日")}, start={"help": _H("新開始日期")},
+    ) + (
+        (("--no-cache",), {"action": "store_true",
+                           "help": _H("不使用任務快取，強制重抓 merge base")}),
+    ),
+    "task-complete": (
+        (("project_id",), {"help": _H("專案 ID")}),
+        (("task_id",), {"help": _H("任務 ID")}),
+    ),
+    "task-delete": (
+        (("project_id",), {"help": _H("專案 ID")}),
+        (("task_id",), {"help": _H("任務 ID")}),
+    ),
+    "task-batch": (
+        (("--file",), {"required": True,
+                       "help": _H("JSON 檔路徑；直接給任務陣列視為全部新增")}),
+    ),
+    "task-recent": (
+        (("--project",), {"required": True, "help": _H("專案 ID")}),
+        (("--limit",), {"type": int, "default": 5, "help": _H("筆數上限（預設 5）")}),
+        (("--tag",), {"help": _H("按 tag 篩選")}),
+        (("--active-only",), {"action": "store_true",
+                              "help": _H("只顯示進行中的任務（排除已完成）")}),
+    ),
+    "search": (
+        (("query",), {"help": _H("搜尋關鍵字")}),
+        (("--active-only",), {"action": "store_true",
+                              "help": _H("只搜尋進行中的任務（排除已完成）")}),
+    ),
+    "completed": (
+        (("--project",), {"help": _H("專案 ID（不指定則全部）")}),
+        (("--limit",), {"type": int, "default": 50, "help": _H("筆數上限")}),
+        (("--tag",), {"help": _H("按 tag 篩選")}),
+    ),
+    "tags": (),
+    "tag-create": (
+        (("--name",), {"required": True, "help": _H("標籤名稱")}),
+        (("--color",), {"help": _H('顏色 hex，如 "#57A8FF"')}),
+        (("--parent",), {"help": _H("父標籤名稱")}),
+    ),
+    "sync": (
+        (("--full",), {"action": "store_true",
+                       "help": _H("輸出完整同步資料（預設只輸出摘要）")}),
+    ),
+    "habits": (),
+    "habit-create": (
+        (("--name",), {"required": True, "help": _H("習慣名稱")}),
+        (("--frequency",), {"type": int, "default": 1,
+                            "help": _H("目標次數（預設 1）")}),
+        (("--period",), {"choices": _PERIOD_CHOICES, "default": "day",
+                         "help": _H("週期：day 或 week（預設 day）")}),
+        (("--color",), {"help": _H("顏色 hex")}),
+        (("--reminder",), {"help": _H('提醒時間，如 "09:00"')}),
+    ),
+    "habit-checkin": (
+        (("--habit",), {"required": True, "help": _H("習慣 ID")}),
+        (("--date",), {"help": _H("日期 YYYYMMDD（預設今天）")}),
+    ),
+    "habit-delete": (
+        (("--habit",), {"required": True, "help": _H("習慣 ID")}),
+    ),
+    "upload-attachment": (
+        (("--project",), {"required": True, "help": _H("專案 ID")}),
+        (("--task",), {"required": True, "help": _H("任務 ID")}),
+        (("--file",), {"required": True, "help": _H("本地檔案路徑")}),
+    ),
+}
+
+
+def build_command_parser(command: str):
+    """由 COMMAND_SPECS 建構單一子命令的 argparse parser（--help / --argparse 用）"""
+    # argparse 只在 help / --argparse 路徑用得到，import 挪進來
+    # 讓手刻 parser 與 fast path 不付這筆（gettext 等連鎖 import）成本
+    import argparse
+
     parser = argparse.ArgumentParser(
-        prog="ticktick_cli",
-        description="TickTick CLI — 任務、專案、標籤、習慣管理工具",
+        prog=f"ticktick_cli {command}",
+        description=COMMAND_HELP.get(command),
     )
-    sub = parser.add_subparsers(dest="command", help="可用命令")
-
-    # ── Projects ─────────────────────────────────────────────────────────
-
-    sub.add_parser("projects", help="列出所有專案")
-
-    p = sub.add_parser("project-get", help="取得專案詳情（含任務）")
-    p.add_argument("project_id", help="專案 ID")
-
-    p = sub.add_parser("project-create", help="建立專案")
-    p.add_argument("--name", required=True, help="專案名稱")
-    p.add_argument("--color", help='顏色 hex，如 "#FF5733"')
-    p.add_argument("--view", choices=["list", "kanban", "timeline"],
-                   help="視圖模式")
-    p.add_argument("--kind", choices=["TASK", "NOTE"], default="TASK",
-                   help="專案類型")
-
-    p = sub.add_parser("project-update", help="更新專案")
-    p.add_argument("project_id", help="專案 ID")
-    p.add_argument("--name", help="新名稱")
-    p.add_argument("--color", help="新顏色")
-
-    p = sub.add_parser("project-delete", help="刪除專案")
-    p.add_argument("project_id", help="專案 ID")
-
-    # ── Tasks ────────────────────────────────────────────────────────────
-
-    p = sub.add_parser("tasks", help="列出任務")
-    p.add_argument("--project", help="專案 ID（不指定則列出全部）")
-    p.add_argument("--status", choices=["pending", "completed"],
-                   help="過濾狀態")
-    p.add_argument("--tag", help="按 tag 篩選")
-
-    p = sub.add_parser("task-get", help="取得單一任務")
-    p.add_argument("project_id", help="專案 ID")
-    p.add_argument("task_id", help="任務 ID")
-
-    p = sub.add_parser("task-create", help="建立任務")
-    p.add_argument("--project", required=True, help="專案 ID")
-    p.add_argument("--title", required=True, help="任務標題")
-    p.add_argument("--content", help="任務內容/備註")
-    p.add_argument("--desc", help="Checklist 描述")
-    p.add_argument("--priority", choices=["none", "low", "medium", "high"],
-                   help="優先級")
-    p.add_argument("--due", help='到期日 "yyyy-MM-ddTHH:mm:ssZ"')
-    p.add_argument("--start", help='開始日期 "yyyy-MM-ddTHH:mm:ssZ"')
-    p.add_argument("--all-day", action="store_true", help="全天任務")
-    p.add_argument("--timezone", help='時區，如 "Asia/Taipei"')
-    p.add_argument("--kind", choices=["TEXT", "NOTE", "CHECKLIST"],
-                   help="任務類型")
-    p.add_argument("--reminder", action="append",
-                   help='提醒規則，如 "TRIGGER:-PT30M"（可多次指定）')
-    p.add_argument("--repeat", help='重複規則 RRULE，如 "RRULE:FREQ=DAILY"')
-    p.add_argument("--subtask", action="append",
-                   help="子任務標題（可多次指定）")
-    p.add_argument("--tag", action="append",
-                   help="標籤（可多次指定）")
-
-    p = sub.add_parser("task-update", help="更新任務")
-    p.add_argument("task_id", help="任務 ID")
-    p.add_argument("--project", required=True, help="專案 ID")
-    p.add_argument("--title", help="新標題")
-    p.add_argument("--content", help="新內容")
-    p.add_argument("--priority", choices=["none", "low", "medium", "high"],
-                   help="新優先級")
-    p.add_argument("--due", help="新到期日")
-    p.add_argument("--start", help="新開始日期")
-    p.add_argument("--tag", action="append",
-                   help="標籤（可多次指定）")
-
-    p = sub.add_parser("task-complete", help="完成任務")
-    p.add_argument("project_id", help="專案 ID")
-    p.add_argument("task_id", help="任務 ID")
-
-    p = sub.add_parser("task-delete", help="刪除任務")
-    p.add_argument("project_id", help="專案 ID")
-    p.add_argument("task_id", help="任務 ID")
-
-    p = sub.add_parser("task-recent",
-                       help="查看專案最近 N 筆任務（含已完成，建立前先確認無重複）")
-    p.add_argument("--project", required=True, help="專案 ID")
-    p.add_argument("--limit", type=int, default=5,
-                   help="筆數上限（預設 5）")
-    p.add_argument("--tag", help="按 tag 篩選")
-    p.add_argument("--active-only", action="store_true",
-                   help="只顯示進行中的任務（排除已完成）")
-
-    # ── 搜尋與歷史 ──────────────────────────────────────────────────────
-
-    p = sub.add_parser("search", help="搜尋任務（預設包含已完成任務）")
-    p.add_argument("query", help="搜尋關鍵字")
-    p.add_argument("--active-only", action="store_true",
-                   help="只搜尋進行中的任務（排除已完成）")
-
-    p = sub.add_parser("completed", help="已完成任務歷史")
-    p.add_argument("--project", help="專案 ID（不指定則全部）")
-    p.add_argument("--limit", type=int, default=50, help="筆數上限")
-    p.add_argument("--tag", help="按 tag 篩選")
-
-    sub.add_parser("tags", help="列出所有標籤")
-
-    p = sub.add_parser("tag-create", help="建立標籤")
-    p.add_argument("--name", required=True, help="標籤名稱")
-    p.add_argument("--color", help='顏色 hex，如 "#57A8FF"')
-    p.add_argument("--parent", help="父標籤名稱")
-
-    p = sub.add_parser("sync", help="全量同步（除錯用）")
-    p.add_argument("--full", action="store_true",
-                   help="輸出完整同步資料（預設只輸出摘要）")
-
-    # ── Habits ──────────────────────────────────────────────────────────
-
-    sub.add_parser("habits", help="列出所有習慣")
-
-    p = sub.add_parser("habit-create", help="建立習慣")
-    p.add_argument("--name", required=True, help="習慣名稱")
-    p.add_argument("--frequency", type=int, default=1,
-                   help="目標次數（預設 1）")
-    p.add_argument("--period", choices=["day", "week"], default="day",
-                   help="週期：day 或 week（預設 day）")
-    p.add_argument("--color", help="顏色 hex")
-    p.add_argument("--reminder", help="提醒時間，如 \"09:00\"")
-
-    p = sub.add_parser("habit-checkin", help="習慣打卡")
-    p.add_argument("--habit", required=True, help="習慣 ID")
-    p.add_argument("--date", help="日期 YYYYMMDD（預設今天）")
-
-    p = sub.add_parser("habit-delete", help="刪除習慣")
-    p.add_argument("--habit", required=True, help="習慣 ID")
-
-    # ── Attachments ─────────────────────────────────────────────────────
-
-    p = sub.add_parser("upload-attachment", help="上傳附件到任務")
-    p.add_argument("--project", required=True, help="專案 ID")
-    p.add_argument("--task", required=True, help="任務 ID")
-    p.add_argument("--file", required=True, help="本地檔案路徑")
+    for flags, kw in COMMAND_SPECS[command]:
+        parser.add_argument(*flags, **kw)
+    return parser
 
+
+def _cli_error(command: str, message: str):
+    print(f"ticktick_cli {command}: error: {message}", file=sys.stderr)
+    sys.exit(2)
+
+
+def _hand_parse(command: str, rest: list):
+    """表格驅動的手刻 parser：吃同一份 COMMAND_SPECS，跳過 argparse 機器
+
+    只支援這個 CLI 實際用到的文法：positional、--flag 值（含 --flag=值）、
+    store_true、append、choices、type、required、default。
+    -h / --help / --argparse 由 main() 先攔走，交給 argparse 路徑。
+    """
+    positionals = []
+    opts = {}
+    ns = {"command": command}
+    for flags, kw in COMMAND_SPECS[command]:
+        if not flags[0].startswith("-"):
+            positionals.append(flags[0])
+            continue
+        dest = flags[0][2:].replace("-", "_")
+        opts[flags[0]] = (dest, kw)
+        if kw.get("action") == "store_true":
+            ns[dest] = False
+        else:
+            ns[dest] = kw.get("default")
+
+    pos_values = []
+    i, n = 0, len(rest)
+    while i < n:
+        arg = rest[i]
+        if arg.startswith("--"):
+            flag, _, inline = arg.partition("=")
+            if flag not in opts:
+                _cli_error(command, f"未知參數: {flag}")
+            dest, kw = opts[flag]
+            action = kw.get("action")
+            if action == "store_true":
+                if inline:
+                    _cli_error(command, f"{flag} 不接受值")
+                ns[dest] = True
+            else:
+                if "=" in arg:
+                    value = inline
+                else:
+                    i += 1
+                    if i >= n:
+                        _cli_error(command, f"{flag} 需要一個值")
+                    value = rest[i]
+                if "type" in kw:
+                    try:
+                        value = kw["type"](value)
+                    except ValueError:
+                        _cli_error(command, f"{flag} 的值無效: {value}")
+                choices = kw.get("choices")
+                if choices is not None and value not in choices:
+                    _cli_error(command,
+                               f"{flag} 只能是 {'/'.join(choices)}: {value}")
+                if action == "append":
+                    if ns[dest] is None:
+                        ns[dest] = []
+                    ns[dest].append(value)
+                else:
+                    ns[dest] = value
+        elif arg.startswith("-") and arg != "-":
+            _cli_error(command, f"未知參數: {arg}")
+        else:
+            pos_values.append(arg)
+        i += 1
+
+    if len(pos_values) != len(positionals):
+        _cli_error(command, "引數數量不符，需要: " + " ".join(positionals))
+    ns.update(zip(positionals, pos_values))
+    for flag, (dest, kw) in opts.items():
+        if kw.get("required") and ns[dest] is None:
+            _cli_error(command, f"缺少必要參數: {flag}")
+    return SimpleNamespace(**ns)
+
+
+_PARSER_CACHE_DIR = os.path.expanduser("~/.cache/ticktick")
+_src_hash = None  # lazy：help 快速路徑不用讀自己的原始碼
+
+
+def _identity(string):
+    # argparse 對 type=None 內建註冊的是 lambda，pickle 不了；
+    # 換成具名函式讓整個 parser 可以 pickle
+    return string
+
+
+def _parser_cache_path(command: str) -> str:
+    global _src_hash
+    if _src_hash is None:
+        import hashlib
+        with open(os.path.abspath(__file__), "rb") as f:
+            _src_hash = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    pyver = f"{sys.version_info[0]}{sys.version_info[1]}"
+    return os.path.join(_PARSER_CACHE_DIR,
+                        f"parser-{pyver}-{_src_hash}-{command}.pkl")
+
+
+def _cached_command_parser(command: str):
+    """磁碟快取 per-command parser（pickle），跨 CLI 行程攤平建構成本
+
+    key 含原始碼 hash + Python 版本：改了程式或換直譯器自動失效。
+    pickle 讀寫任何失敗都直接 fall back 回現建，快取純屬加速。
+    """
+    import pickle
+    path = _parser_cache_path(command)
+    try:
+        with open(path, "rb") as f:
+            parser = pickle.load(f)
+    except Exception:
+        pass
+    else:
+        import argparse
+
+        # pickle 複製了 argparse.SUPPRESS 字串，破壞 parse_args 內部
+        # `default is SUPPRESS` 的 identity 判斷——不還原的話，快取命中
+        # 的 parser 會在 namespace 多塞一個 help='==SUPPRESS==' 屬性，
+        # 跟現建 parser 的結果不一致。載回後換回同一個物件。
+        for action in parser._actions:
+            if action.default == argparse.SUPPRESS:
+                action.default = argparse.SUPPRESS
+        return parser
+    parser = build_command_parser(command)
+    parser.register("type", None, _identity)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_PARSER_CACHE_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(parser, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
     return parser
 
 
+def _static_help() -> str:
+    """不建任何 subparser 就能印的命令總覽"""
+    lines = [
+        "用法: ticktick_cli <command> [options]",
+        "",
+        "TickTick CLI — 任務、專案、標籤、習慣管理工具",
+        "",
+        "可用命令（ticktick_cli <command> -h 看個別參數）:",
+    ]
+    lines += [f"  {cmd:<19}{text}" for cmd, text in COMMAND_HELP.items()]
+    return "\n".join(lines)
+
+
 # =============================================================================
 # 入口
 # =============================================================================
 
-COMMAND_MAP = {
+# 純 positional、無任何 flag 的命令：直接切 argv 就夠，不動用 argparse。
+# 引數數量不符或帶了 -h / flag 時照走 argparse 路徑。
+_POSITIONAL_ONLY = {
+    "projects": (),
+    "tags": (),
+    "habits": (),
+    "project-get": ("project_id",),
+    "project-delete": ("project_id",),
+    "task-get": ("project_id", "task_id"),
+    "task-complete": ("project_id", "task_id"),
+    "task-delete": ("project_id", "task_id"),
+    "search": ("query",),
+}
+
+# 快速路徑也要補上 handler 會讀的 optional 欄位預設值
+_POSITIONAL_DEFAULTS = {
+    "search": {"active_only": False},
+}
+
+# key 先 intern：dispatch 時的 dict 查找走指標比較的快路徑
+COMMAND_MAP = {sys.intern(k): v for k, v in {
     "projects": cmd_projects,
     "project-get": cmd_project_get,
     "project-create": cmd_project_create,
@@ -583,6 +854,7 @@ COMMAND_MAP = {
     "task-update": cmd_task_update,
     "task-complete": cmd_task_complete,
     "task-delete": cmd_task_delete,
+    "task-batch": cmd_task_batch,
     "task-recent": cmd_task_recent,
     "search": cmd_search,
     "completed": cmd_completed,
@@ -594,23 +866,45 @@ COMMAND_MAP = {
     "habit-create": cmd_habit_create,
     "habit-checkin": cmd_habit_checkin,
     "habit-delete": cmd_habit_delete,
-}
+}.items()}
 
 
 def main():
-    parser = build_parser()
-    args = parser.parse_args()
-
-    if not args.command:
-        parser.print_help()
+    # 最常見的冷啟動是 --help / 沒給命令 / 打錯命令：直接看 sys.argv，
+    # 這三條路徑連 ArgumentParser 都不建
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_static_help())
+        sys.exit(1 if not argv else 0)
+
+    command = sys.intern(argv[0])
+    if command not in COMMAND_MAP:
+        print(_static_help(), file=sys.stderr)
         sys.exit(1)
 
-    handler = COMMAND_MAP.get(args.command)
-    if handler:
-        handler(args)
+    rest = argv[1:]
+    spec = _POSITIONAL_ONLY.get(command)
+    if (spec is not None and len(rest) == len(spec)
+            and not any(a.startswith("-") for a in rest)):
+        args = SimpleNamespace(command=command, **dict(zip(spec, rest)))
+        for key, value in _POSITIONAL_DEFAULTS.get(command, {}).items():
+            setattr(args, key, value)
+    elif "-h" in rest or "--help" in rest or "--argparse" in rest:
+        # argparse 路徑：產生完整 help，--argparse 當除錯用的逃生口
+        rest = [a for a in rest if a != "--argparse"]
+        args = _cached_command_parser(command).parse_args(rest)
+        args.command = command
     else:
-        parser.print_help()
-        sys.exit(1)
+        args = _hand_parse(command, rest)
+
+    _load_api()
+    # 前面已驗過 command in COMMAND_MAP，直接索引即可
+    handler = COMMAND_MAP[command]
+    # API 層只 raise，不 sys.exit；CLI 入口統一收尾成 JSON 錯誤輸出
+    try:
+        handler(args)
+    except TickTickAPIError as e:
+        _error_exit(str(e))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,16 @@
 import os
 import sys
 
+import pytest
+
 # ticktick_api.py lives in ../scripts (no package install); put it on the path.
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import ticktick_api  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk sync cache out of the real ~/.cache during tests."""
+    monkeypatch.setattr(ticktick_api.TickTickAPI, "CACHE_DIR",
+                        str(tmp_path / "ticktick-cache"))
@@ -1,40 +1,49 @@
 """Behavioural regression tests for TickTickAPI.
 
 These exercise the public methods (search_tasks, list_projects, ...) with the
-network boundary (urllib.request.urlopen) mocked, so they run offline and pin
-the bug fixes documented alongside them.
+network boundary (the pooled requests.Session) mocked, so they run offline and
+pin the bug fixes documented alongside them.
 """
 import io
 import json
-import urllib.error
+import os
 from datetime import datetime, timezone
 
 import pytest
+import requests
 
 import ticktick_api
-from ticktick_api import TickTickAPI
+from ticktick_api import TickTickAPI, TickTickAPIError
 
 
-class _FakeHeaders:
-    def get_all(self, key):
-        return []
+class _FakeRaw(io.BytesIO):
+    """BytesIO subclass so tests can set .decode_content like urllib3's raw."""
 
 
 class _FakeResp:
-    """Minimal stand-in for the urlopen context-manager response."""
+    """Minimal stand-in for a requests.Response."""
 
-    def __init__(self, body, headers=None):
-        self._body = body.encode("utf-8") if isinstance(body, str) else body
-        self.headers = headers or _FakeHeaders()
+    def __init__(self, body, status=200, headers=None):
+        self.status_code = status
+        self.content = body.encode("utf-8") if isinstance(body, str) else body
+        self.headers = headers or {}
+        self.cookies = {}
+        self.raw = _FakeRaw(self.content)
+        self.closed = False
 
-    def read(self):
-        return self._body
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
 
-    def __enter__(self):
-        return self
+    def json(self):
+        return json.loads(self.content)
 
-    def __exit__(self, *exc):
-        return False
+    def iter_content(self, chunk_size=64 * 1024):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
 
 
 def _api_no_login():
@@ -44,10 +53,13 @@ def _api_no_login():
     api.csrf_token = None
     api.inbox_id = ""
     api._device_id = "65a0test"
+    api._init_header_cache()
     api._sync_cache = None
     api._sync_cache_time = 0
     api._username = "user@example.com"
     api._password = "pw"
+    api._session = TickTickAPI._build_session()
+    api._task_cache = {}
     return api
 
 
@@ -67,18 +79,16 @@ def test_search_ignores_tasks_with_null_content(monkeypatch):
 # ── Cycle 2: connection-level failures go through the error path ─────────
 def test_network_error_goes_through_error_path(monkeypatch):
     api = _api_no_login()
-    monkeypatch.setattr(ticktick_api, "_error_exit",
-                        lambda msg: (_ for _ in ()).throw(RuntimeError(msg)))
     monkeypatch.setattr(ticktick_api.time, "sleep", lambda *_: None)  # skip retry backoff
 
     def boom(*a, **k):
-        raise urllib.error.URLError("connection timed out")
+        raise requests.exceptions.ConnectionError("connection timed out")
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", boom)
-    # A network/timeout failure must surface via the library's error path
-    # (so the backend maps it to a clean 502), not leak as a raw URLError.
-    with pytest.raises(RuntimeError) as ei:
-        api.list_projects()  # → sync → _request → urlopen
+    monkeypatch.setattr(api._session, "request", boom)
+    # A network/timeout failure must surface as the library's typed error
+    # (so callers can map it cleanly), not leak as a raw requests exception.
+    with pytest.raises(TickTickAPIError) as ei:
+        api.list_projects()  # → sync → _request → session
     assert "逾時" in str(ei.value) or "連線" in str(ei.value)
 
 
@@ -86,16 +96,20 @@ def test_network_error_goes_through_error_path(monkeypatch):
 def test_login_is_bounded_by_a_timeout(monkeypatch):
     api = TickTickAPI.__new__(TickTickAPI)
     api._device_id = "65a0test"
+    api._init_header_cache()
     api.session_token = None
     api.csrf_token = None
     api.inbox_id = None
+    api._username = "user@example.com"
+    api._password = "pw"
+    api._session = TickTickAPI._build_session()
     captured = {}
 
-    def fake_urlopen(req, timeout=None):
+    def fake_post(url, timeout=None, **kw):
         captured["timeout"] = timeout
         return _FakeResp(json.dumps({"token": "tok", "inboxId": "ib"}))
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
+    monkeypatch.setattr(api._session, "post", fake_post)
     api._login("user@example.com", "pw")
     assert api.session_token == "tok"
     # login must not be able to hang forever
@@ -108,18 +122,18 @@ def test_expired_session_triggers_relogin_and_retry(monkeypatch):
     api.session_token = "expired"
     calls = {"data": 0, "login": 0}
 
-    def fake_urlopen(req, timeout=None):
-        url = req.full_url
-        if "/user/sign" in url:
-            calls["login"] += 1
-            return _FakeResp(json.dumps({"token": "fresh-token", "inboxId": "ib"}))
+    def fake_request(method, url, **kw):
         calls["data"] += 1
         if calls["data"] == 1:
-            raise urllib.error.HTTPError(
-                url, 401, "Unauthorized", {}, io.BytesIO(b'{"errorId":"not_login"}'))
+            return _FakeResp('{"errorId":"not_login"}', status=401)
         return _FakeResp(json.dumps({"projectProfiles": [{"id": "p1"}]}))
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
+    def fake_post(url, **kw):
+        calls["login"] += 1
+        return _FakeResp(json.dumps({"token": "fresh-token", "inboxId": "ib"}))
+
+    monkeypatch.setattr(api._session, "request", fake_request)
+    monkeypatch.setattr(api._session, "post", fake_post)
     # sync → _request gets 401 → should re-login once and retry, returning data.
     projects = api.list_projects()
     assert projects == [{"id": "p1"}]
@@ -132,12 +146,12 @@ def test_move_task_posts_to_taskProject(monkeypatch):
     api = _api_no_login()
     captured = {}
 
-    def fake_urlopen(req, timeout=None):
-        captured["url"] = req.full_url
-        captured["body"] = json.loads(req.data.decode())
+    def fake_request(method, url, data=None, **kw):
+        captured["url"] = url
+        captured["body"] = json.loads(data.decode())
         return _FakeResp("{}")
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
+    monkeypatch.setattr(api._session, "request", fake_request)
     api.move_task("T1", "P_from", "P_to")
     assert captured["url"].endswith("/batch/taskProject")
     assert captured["body"] == [
@@ -150,11 +164,11 @@ def test_move_all_moves_every_task_in_project(monkeypatch):
         {"id": "t1", "projectId": "P_from"}, {"id": "t2", "projectId": "P_from"}]}})
     captured = {}
 
-    def fake_urlopen(req, timeout=None):
-        captured["body"] = json.loads(req.data.decode())
+    def fake_request(method, url, data=None, **kw):
+        captured["body"] = json.loads(data.decode())
         return _FakeResp("{}")
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
+    monkeypatch.setattr(api._session, "request", fake_request)
     api.move_all("P_from", "P_to")
     assert [m["taskId"] for m in captured["body"]] == ["t1", "t2"]
     assert all(m["fromProjectId"] == "P_from" and m["toProjectId"] == "P_to"
@@ -166,12 +180,12 @@ def test_make_subtask_posts_to_taskParent(monkeypatch):
     api = _api_no_login()
     captured = {}
 
-    def fake_urlopen(req, timeout=None):
-        captured["url"] = req.full_url
-        captured["body"] = json.loads(req.data.decode())
+    def fake_request(method, url, data=None, **kw):
+        captured["url"] = url
+        captured["body"] = json.loads(data.decode())
         return _FakeResp("{}")
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
+    monkeypatch.setattr(api._session, "request", fake_request)
     api.make_subtask("CHILD", "PARENT", "P1")
     assert captured["url"].endswith("/batch/taskParent")
     assert captured["body"] == [
@@ -184,14 +198,13 @@ def test_request_retries_on_5xx_then_succeeds(monkeypatch):
     monkeypatch.setattr(ticktick_api.time, "sleep", lambda *_: None)  # no real delay
     calls = {"n": 0}
 
-    def fake_urlopen(req, timeout=None):
+    def fake_request(method, url, **kw):
         calls["n"] += 1
         if calls["n"] == 1:
-            raise urllib.error.HTTPError(
-                req.full_url, 503, "Service Unavailable", {}, io.BytesIO(b"busy"))
+            return _FakeResp("busy", status=503)
         return _FakeResp(json.dumps({"projectProfiles": [{"id": "p1"}]}))
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
+    monkeypatch.setattr(api._session, "request", fake_request)
     assert api.list_projects() == [{"id": "p1"}]
     assert calls["n"] == 2  # one transient failure, then success
 
@@ -199,30 +212,44 @@ def test_request_retries_on_5xx_then_succeeds(monkeypatch):
 def test_request_does_not_retry_4xx(monkeypatch):
     api = _api_no_login()
     api._username = None  # disable relogin path so 401/4xx goes straight to error
-    monkeypatch.setattr(ticktick_api, "_error_exit",
-                        lambda msg: (_ for _ in ()).throw(RuntimeError(msg)))
     monkeypatch.setattr(ticktick_api.time, "sleep", lambda *_: None)
     calls = {"n": 0}
 
-    def fake_urlopen(req, timeout=None):
+    def fake_request(method, url, **kw):
         calls["n"] += 1
-        raise urllib.error.HTTPError(
-            req.full_url, 400, "Bad Request", {}, io.BytesIO(b"nope"))
+        return _FakeResp("nope", status=400)
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake_urlopen)
-    with pytest.raises(RuntimeError):
+    monkeypatch.setattr(api._session, "request", fake_request)
+    with pytest.raises(TickTickAPIError) as ei:
         api.list_projects()
     assert calls["n"] == 1  # 4xx is not transient — no retry
+    assert ei.value.status == 400
+
+
+def test_request_retries_on_429_honoring_retry_after(monkeypatch):
+    api = _api_no_login()
+    slept = []
+    monkeypatch.setattr(ticktick_api.time, "sleep", slept.append)
+    calls = {"n": 0}
+
+    def fake_request(method, url, **kw):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return _FakeResp("slow down", status=429, headers={"Retry-After": "3"})
+        return _FakeResp(json.dumps({"projectProfiles": []}))
+
+    monkeypatch.setattr(api._session, "request", fake_request)
+    assert api.list_projects() == []
+    assert calls["n"] == 2
+    assert slept == [3]  # server-provided delay is honored
 
 
 # ── Cycle D: tag/habit colors are validated before hitting the network ──
 def test_create_tag_rejects_invalid_hex_color(monkeypatch):
     api = _api_no_login()
-    monkeypatch.setattr(ticktick_api, "_error_exit",
-                        lambda msg: (_ for _ in ()).throw(RuntimeError(msg)))
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen",
+    monkeypatch.setattr(api._session, "request",
                         lambda *a, **k: (_ for _ in ()).throw(AssertionError("network reached")))
-    with pytest.raises(RuntimeError) as ei:
+    with pytest.raises(TickTickAPIError) as ei:
         api.create_tag("work", color="blue")
     assert "color" in str(ei.value).lower() or "顏色" in str(ei.value)
 
@@ -231,15 +258,224 @@ def test_create_tag_accepts_valid_hex_color(monkeypatch):
     api = _api_no_login()
     captured = {}
 
-    def fake(req, timeout=None):
-        captured["body"] = json.loads(req.data.decode())
+    def fake_request(method, url, data=None, **kw):
+        captured["body"] = json.loads(data.decode())
         return _FakeResp("{}")
 
-    monkeypatch.setattr(ticktick_api.urllib.request, "urlopen", fake)
+    monkeypatch.setattr(api._session, "request", fake_request)
     api.create_tag("work", color="#FF5733")
     assert captured["body"]["add"][0]["color"] == "#FF5733"
 
 
+# ── Cycle F: sync() is cached on disk across processes ──────────────────
+def test_sync_disk_cache_serves_second_client_without_network(monkeypatch):
+    api = _api_no_login()
+    calls = {"n": 0}
+
+    def fake_request(method, url, **kw):
+        calls["n"] += 1
+        return _FakeResp(json.dumps({"projectProfiles": [{"id": "p1"}]}))
+
+    monkeypatch.setattr(api._session, "request", fake_request)
+    api.sync()
+    assert calls["n"] == 1
+
+    # A fresh client (≈ a new CLI process) must hit the disk tier, not the API.
+    api2 = _api_no_login()
+    monkeypatch.setattr(api2._session, "request",
+                        lambda *a, **k: (_ for _ in ()).throw(AssertionError("network reached")))
+    assert api2.sync() == {"projectProfiles": [{"id": "p1"}]}
+
+
+def test_mutation_invalidates_disk_cache(monkeypatch):
+    api = _api_no_login()
+    monkeypatch.setattr(api._session, "request",
+                        lambda *a, **k: _FakeResp("{}"))
+    api.sync()
+    assert os.path.exists(api._sync_disk_path())
+    api.delete_task("P1", "T1")  # mutation → both cache tiers cleared
+    assert not os.path.exists(api._sync_disk_path())
+
+
+# ── Cycle J: bulk workflows go through one /batch/task request ──────────
+def test_batch_create_sends_single_request(monkeypatch):
+    api = _api_no_login()
+    captured = {"n": 0}
+
+    def fake_request(method, url, data=None, **kw):
+        captured["n"] += 1
+        captured["url"] = url
+        captured["body"] = json.loads(data.decode())
+        return _FakeResp("{}")
+
+    monkeypatch.setattr(api._session, "request", fake_request)
+    tasks = [{"title": f"t{i}", "projectId": "P1"} for i in range(3)]
+    api.batch_create_tasks(tasks)
+    assert captured["n"] == 1
+    assert captured["url"].endswith("/batch/task")
+    assert captured["body"] == {"add": tasks}
+
+
+def test_batch_delete_evicts_task_cache(monkeypatch):
+    api = _api_no_login()
+    api._task_cache[("P1", "T1")] = ({"id": "T1"}, 1e18)
+    monkeypatch.setattr(api._session, "request",
+                        lambda *a, **k: _FakeResp("{}"))
+    api.batch_delete_tasks([{"taskId": "T1", "projectId": "P1"}])
+    assert ("P1", "T1") not in api._task_cache
+
+
+# ── Cycle I: the login session survives across processes ────────────────
+def test_saved_session_is_reused_by_a_fresh_client():
+    api = _api_no_login()
+    api.session_token = "tok-123"
+    api.csrf_token = "csrf-456"
+    api.inbox_id = "inbox"
+    api._save_session_to_disk()
+
+    api2 = _api_no_login()
+    api2.session_token = None
+    assert api2._load_session_from_disk() is True
+    assert api2.session_token == "tok-123"
+    assert api2.csrf_token == "csrf-456"
+
+
+def test_expired_saved_session_is_ignored(monkeypatch):
+    api = _api_no_login()
+    api.session_token = "tok-123"
+    monkeypatch.setattr(TickTickAPI, "SESSION_TTL", -1)  # written already expired
+    api._save_session_to_disk()
+
+    api2 = _api_no_login()
+    api2.session_token = None
+    assert api2._load_session_from_disk() is False
+    assert api2.session_token is None
+
+
+# ── Cycle H: response reads are bounded ─────────────────────────────────
+def test_oversized_response_is_rejected(monkeypatch):
+    api = _api_no_login()
+    monkeypatch.setattr(TickTickAPI, "MAX_RESPONSE_BYTES", 64)
+    monkeypatch.setattr(api._session, "request",
+                        lambda *a, **k: _FakeResp(b"x" * 1024))
+    with pytest.raises(TickTickAPIError) as ei:
+        api.sync(force=True)
+    assert "上限" in str(ei.value) or "過大" in str(ei.value)
+
+
+# ── Cycle G: back-to-back updates reuse the cached merge base ───────────
+def test_second_update_skips_the_merge_base_refetch(monkeypatch):
+    api = _api_no_login()
+    calls = {"get": 0}
+
+    def fake_get(pid, tid):
+        calls["get"] += 1
+        return {"id": tid, "projectId": pid, "title": "old", "attachments": ["a"]}
+
+    monkeypatch.setattr(api, "get_task", fake_get)
+    captured = {}
+
+    def fake_request(method, url, data=None, **kw):
+        captured["body"] = json.loads(data.decode())
+        return _FakeResp("{}")
+
+    monkeypatch.setattr(api._session, "request", fake_request)
+    api.update_task({"id": "T1", "projectId": "P1", "title": "new"})
+    api.update_task({"id": "T1", "projectId": "P1", "priority": 5})
+    assert calls["get"] == 1  # second update merges onto the cached result
+    merged = captured["body"]["update"][0]
+    assert merged["title"] == "new"
+    assert merged["priority"] == 5
+    assert merged["attachments"] == ["a"]  # untouched fields survive the merge
+
+
+def test_update_with_use_cache_false_always_refetches(monkeypatch):
+    api = _api_no_login()
+    calls = {"get": 0}
+
+    def fake_get(pid, tid):
+        calls["get"] += 1
+        return {"id": tid, "projectId": pid, "title": "old"}
+
+    monkeypatch.setattr(api, "get_task", fake_get)
+    monkeypatch.setattr(api._session, "request",
+                        lambda *a, **k: _FakeResp("{}"))
+    api.update_task({"id": "T1", "projectId": "P1", "title": "a"}, use_cache=False)
+    api.update_task({"id": "T1", "projectId": "P1", "title": "b"}, use_cache=False)
+    assert calls["get"] == 2
+
+
+# ── Cycle K: search_stream streams, relogins, and releases the conn ─────
+class _StubIjson:
+    """Stands in for the optional ijson dependency (not installed in CI)."""
+
+    @staticmethod
+    def items(raw, prefix):
+        assert prefix == "syncTaskBean.update.item"
+        data = json.loads(raw.read())
+        yield from data.get("syncTaskBean", {}).get("update", [])
+
+
+def _stream_payload(tasks):
+    return json.dumps({"syncTaskBean": {"update": tasks}})
+
+
+def test_search_stream_yields_only_matching_tasks(monkeypatch):
+    api = _api_no_login()
+    monkeypatch.setattr(ticktick_api, "ijson", _StubIjson)
+    tasks = [{"id": "1", "title": "buy needle"}, {"id": "2", "title": "other"}]
+    monkeypatch.setattr(api._session, "request",
+                        lambda *a, **k: _FakeResp(_stream_payload(tasks)))
+    assert [t["id"] for t in api.search_stream("needle")] == ["1"]
+
+
+def test_search_stream_relogins_once_on_401(monkeypatch):
+    api = _api_no_login()
+    monkeypatch.setattr(ticktick_api, "ijson", _StubIjson)
+    calls = {"data": 0, "login": 0}
+
+    def fake_request(method, url, **kw):
+        calls["data"] += 1
+        if calls["data"] == 1:
+            return _FakeResp('{"errorId":"not_login"}', status=401)
+        return _FakeResp(_stream_payload([{"id": "1", "title": "needle"}]))
+
+    def fake_post(url, **kw):
+        calls["login"] += 1
+        return _FakeResp(json.dumps({"token": "fresh", "inboxId": "ib"}))
+
+    monkeypatch.setattr(api._session, "request", fake_request)
+    monkeypatch.setattr(api._session, "post", fake_post)
+    # Same contract as _request: one transparent relogin, then the stream.
+    assert [t["id"] for t in api.search_stream("needle")] == ["1"]
+    assert calls["login"] == 1
+    assert api.session_token == "fresh"
+
+
+def test_search_stream_raises_and_closes_on_4xx(monkeypatch):
+    api = _api_no_login()
+    monkeypatch.setattr(ticktick_api, "ijson", _StubIjson)
+    resp = _FakeResp("forbidden", status=403)
+    monkeypatch.setattr(api._session, "request", lambda *a, **k: resp)
+    with pytest.raises(TickTickAPIError) as ei:
+        list(api.search_stream("x"))
+    assert ei.value.status == 403
+    assert resp.closed
+
+
+def test_search_stream_closes_connection_when_abandoned(monkeypatch):
+    api = _api_no_login()
+    monkeypatch.setattr(ticktick_api, "ijson", _StubIjson)
+    tasks = [{"id": str(i), "title": "needle"} for i in range(3)]
+    resp = _FakeResp(_stream_payload(tasks))
+    monkeypatch.setattr(api._session, "request", lambda *a, **k: resp)
+    gen = api.search_stream("needle")
+    next(gen)
+    gen.close()  # caller walks away mid-stream
+    # the pooled connection must not be left stranded
+    assert resp.closed
+
+
 # ── Cycle E: datetime → TickTick date string (offset with NO colon) ─────
 def test_to_ticktick_date_local_zone_offset_has_no_colon():
     dt = datetime(2026, 6, 20, 8, 30, 0)  # naive, interpreted in the given zone
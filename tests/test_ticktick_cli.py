@@ -0,0 +1,116 @@
+"""Parity tests for the hand-rolled CLI parser.
+
+_hand_parse replaces argparse on every non-help invocation, so for each
+command in COMMAND_SPECS a representative argv is parsed through both
+paths and the namespaces must match attribute-for-attribute. The error
+paths (missing required flag, bad choice, bad type, wrong positional
+count, unknown flag) must exit with argparse's code 2.
+"""
+import os
+
+import pytest
+
+import ticktick_cli as cli
+
+
+def _sample_argv(specs, minimal=False):
+    """Build a representative argv straight from a command's spec table."""
+    argv = []
+    for flags, kw in specs:
+        flag = flags[0]
+        if not flag.startswith("-"):
+            argv.append(f"{flag}-value")
+            continue
+        if minimal and not kw.get("required"):
+            continue
+        if kw.get("action") == "store_true":
+            if not minimal:
+                argv.append(flag)
+        elif kw.get("action") == "append":
+            argv += [flag, "one", flag, "two"]
+        elif "type" in kw:
+            argv += [flag, "7"]
+        elif "choices" in kw:
+            argv += [flag, kw["choices"][0]]
+        else:
+            argv += [flag, "value"]
+    return argv
+
+
+def _argparse_parse(command, argv):
+    args = cli.build_command_parser(command).parse_args(list(argv))
+    args.command = command
+    return args
+
+
+@pytest.mark.parametrize("command", sorted(cli.COMMAND_SPECS))
+def test_hand_parse_matches_argparse(command):
+    argv = _sample_argv(cli.COMMAND_SPECS[command])
+    hand = cli._hand_parse(command, list(argv))
+    assert vars(hand) == vars(_argparse_parse(command, argv))
+
+
+@pytest.mark.parametrize("command", sorted(cli.COMMAND_SPECS))
+def test_hand_parse_matches_argparse_with_defaults(command):
+    # required-only argv: every optional must fall back to the same default
+    argv = _sample_argv(cli.COMMAND_SPECS[command], minimal=True)
+    hand = cli._hand_parse(command, list(argv))
+    assert vars(hand) == vars(_argparse_parse(command, argv))
+
+
+def test_hand_parse_accepts_flag_equals_value():
+    argv = ["--project=p1", "--limit=3"]
+    hand = cli._hand_parse("task-recent", list(argv))
+    assert vars(hand) == vars(_argparse_parse("task-recent", argv))
+    assert hand.limit == 3
+
+
+def test_missing_required_flag_exits_2():
+    with pytest.raises(SystemExit) as ei:
+        cli._hand_parse("task-create", ["--project", "p1"])  # no --title
+    assert ei.value.code == 2
+
+
+def test_bad_choice_exits_2():
+    with pytest.raises(SystemExit) as ei:
+        cli._hand_parse("task-create",
+                        ["--project", "p1", "--title", "t",
+                         "--priority", "urgent"])
+    assert ei.value.code == 2
+
+
+def test_bad_int_value_exits_2():
+    with pytest.raises(SystemExit) as ei:
+        cli._hand_parse("task-recent", ["--project", "p1", "--limit", "abc"])
+    assert ei.value.code == 2
+
+
+def test_wrong_positional_count_exits_2():
+    with pytest.raises(SystemExit) as ei:
+        cli._hand_parse("task-get", ["only-one-id"])
+    assert ei.value.code == 2
+
+
+def test_unknown_flag_exits_2():
+    with pytest.raises(SystemExit) as ei:
+        cli._hand_parse("tasks", ["--bogus"])
+    assert ei.value.code == 2
+
+
+def test_flag_missing_its_value_exits_2():
+    with pytest.raises(SystemExit) as ei:
+        cli._hand_parse("tasks", ["--project"])
+    assert ei.value.code == 2
+
+
+def test_parser_cache_hit_parses_identically(tmp_path, monkeypatch):
+    # Pickling breaks the identity of argparse.SUPPRESS, which once leaked a
+    # spurious help='==SUPPRESS==' attribute into cache-hit namespaces.
+    monkeypatch.setattr(cli, "_PARSER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cli, "_src_hash", None)
+    fresh = cli.build_command_parser("sync").parse_args(["--full"])
+
+    cli._cached_command_parser("sync")  # miss → build + write the pickle
+    assert os.path.exists(cli._parser_cache_path("sync"))
+    cached = cli._cached_command_parser("sync").parse_args(["--full"])
+    assert vars(cached) == vars(fresh)